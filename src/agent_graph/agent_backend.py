@@ -1,7 +1,15 @@
+import contextvars
 import json
-from typing import Annotated, Literal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Literal, Tuple
 from typing_extensions import TypedDict
 from langgraph.graph.message import add_messages
+from agent_graph.rag_batch import BATCH_WINDOW
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, fall back to the standard library
+    orjson = None
 
 
 class State(TypedDict):
@@ -13,13 +21,67 @@ class State(TypedDict):
     """
     messages: Annotated[list, add_messages]
 
+
+def _dumps(obj) -> str:
+    """
+    Serialize a tool result to a JSON string, using orjson when it is installed.
+
+    Args:
+        obj: The tool result.
+
+    Returns:
+        str: JSON representation of the result; unsupported types are converted with `str`.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, default=str)
+
+
+def _loads(data: str) -> dict:
+    """
+    Parse JSON-encoded tool arguments, using orjson when it is installed.
+
+    Args:
+        data (str): JSON string of the tool arguments.
+
+    Returns:
+        dict: The parsed arguments.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _unpack(tool_call) -> Tuple[str, dict, str]:
+    """
+    Extract the name, arguments and id from a tool call in any of the supported formats.
+
+    Args:
+        tool_call (dict | object): A tool call in the old Fireworks dict format, the LangChain
+            dict format, or the Fireworks object format.
+
+    Returns:
+        Tuple[str, dict, str]: The tool name, its parsed arguments and the tool call id.
+    """
+    match tool_call:
+        case {"function": {"name": name, "arguments": arguments}, "id": tool_call_id}:
+            # Old format: {'function': {'name': '...', 'arguments': '...'}, 'id': '...'}
+            return name, _loads(arguments), tool_call_id
+        case {"name": name, "args": args, "id": tool_call_id}:
+            # New format: {'name': '...', 'args': {...}, 'id': '...'}, args already a dict
+            return name, args, tool_call_id
+        case _:
+            # Object format (original Fireworks object)
+            return tool_call.function.name, _loads(tool_call.function.arguments), tool_call.id
+
+
 class BasicToolNode:
     """
     Node for executing tools requested in the last AIMessage.
 
     This class maps tool names to callable tool objects and handles both the
-    legacy and modern tool call formats. It processes the tool calls and returns
-    structured responses to be used in the LangGraph flow.
+    legacy and modern tool call formats. It runs independent tool calls concurrently
+    and returns structured responses, in call order, to be used in the LangGraph flow.
     """
     def __init__(self, tools: list) -> None:
         """
@@ -28,8 +90,9 @@ class BasicToolNode:
         Args:
             tools (list): A list of tools, each having a `.name` attribute and an `.invoke()` method.
         """
-        # For StructuredTool objects, use .name attribute
-        self.tools_by_name = {tool.name: tool for tool in tools}
+        # Bound `invoke` methods keyed by the StructuredTool's .name, resolved once so
+        # dispatch is a single dict lookup per call
+        self._fast = {tool.name: tool.invoke for tool in tools}
 
     def __call__(self, inputs: dict):
         """
@@ -43,44 +106,51 @@ class BasicToolNode:
         """
         messages = inputs.get("messages", [])
         message = messages[-1]
+        calls = [_unpack(tool_call) for tool_call in message.tool_calls]
+
+        # Tools are I/O-bound (LLM APIs, web search, vector DB), so independent calls run concurrently
+        if len(calls) > 1:
+            # Let RAG lookups of this turn share batched vector DB queries; each worker gets
+            # its own copy of the context so it sees the batch window
+            token = BATCH_WINDOW.set(True)
+            try:
+                with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+                    futures = [
+                        executor.submit(contextvars.copy_context().run, self._invoke, tool_name, tool_args)
+                        for tool_name, tool_args, _ in calls
+                    ]
+                    results = [future.result() for future in futures]
+            finally:
+                BATCH_WINDOW.reset(token)
+        else:
+            results = [self._invoke(tool_name, tool_args) for tool_name, tool_args, _ in calls]
+
         outputs = []
-                
-        for tool_call in message.tool_calls:
-                        
-            # Handle both dictionary and object formats
-            if isinstance(tool_call, dict):
-                # Check if it's the new format (name/args directly) or old format (function nested)
-                if "function" in tool_call:
-                    # Old format: {'function': {'name': '...', 'arguments': '...'}, 'id': '...'}
-                    tool_name = tool_call["function"]["name"]
-                    tool_args = json.loads(tool_call["function"]["arguments"])
-                    tool_call_id = tool_call["id"]
-                else:
-                    # New format: {'name': '...', 'args': {...}, 'id': '...'}
-                    tool_name = tool_call["name"]
-                    tool_args = tool_call["args"]  # Already a dict, no need to json.loads
-                    tool_call_id = tool_call["id"]
-            else:
-                # Object format (original Fireworks object)
-                tool_name = tool_call.function.name
-                tool_args = json.loads(tool_call.function.arguments)
-                tool_call_id = tool_call.id
-            
-            # Get the tool and invoke it
-            if tool_name in self.tools_by_name:
-                tool = self.tools_by_name[tool_name]
-                result = tool.invoke(tool_args)
-            else:
-                result = f"Unknown tool: {tool_name}"
-            
+        for (tool_name, _, tool_call_id), result in zip(calls, results):
             outputs.append({
                 "role": "tool",
-                "content": json.dumps(result),
+                "content": _dumps(result),
                 "name": tool_name,
                 "tool_call_id": tool_call_id,
             })
         return {"messages": outputs}
 
+    def _invoke(self, tool_name: str, tool_args: dict):
+        """
+        Invoke a single tool by name.
+
+        Args:
+            tool_name (str): Name of the tool to run.
+            tool_args (dict): Arguments passed to the tool.
+
+        Returns:
+            Any: The tool result, or an error string if the tool is unknown.
+        """
+        invoke = self._fast.get(tool_name)
+        if invoke is None:
+            return f"Unknown tool: {tool_name}"
+        return invoke(tool_args)
+
 
 def route_tools(
     state: State,
@@ -109,6 +179,5 @@ def route_tools(
     else:
         raise ValueError(
             f"No messages found in input state to tool_edge: {state}")
-    if hasattr(ai_message, "tool_calls") and len(ai_message.tool_calls) > 0:
-        return "tools"
-    return "__end__"
+    tool_calls = getattr(ai_message, "tool_calls", None)
+    return "tools" if tool_calls else "__end__"
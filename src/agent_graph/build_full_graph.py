@@ -1,5 +1,6 @@
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph, START
+from langgraph.config import get_stream_writer
 from fireworks.client import ChatCompletion
 from langchain_core.messages import AIMessage
 from agent_graph.tool_chinook_sqlagent import query_chinook_sqldb
@@ -138,45 +139,56 @@ def build_graph():
                         'tool_call_id': msg_dict.get('tool_call_id', '')
                     })
         
-        # Tell the LLM which tools it can call
-        response = ChatCompletion.create(
+        # Tell the LLM which tools it can call. The completion is streamed so that content tokens
+        # can be forwarded to the UI through LangGraph's "custom" stream mode as they arrive.
+        writer = get_stream_writer()
+        stream = ChatCompletion.create(
             model=TOOLS_CFG.primary_agent_llm,
             messages=messages,
             functions=tools,
             function_call="auto",
-            temperature=TOOLS_CFG.primary_agent_llm_temperature
+            temperature=TOOLS_CFG.primary_agent_llm_temperature,
+            stream=True
         )
-        
-        # Convert the response to LangChain format
-        response_msg = response.choices[0].message
-        
+
+        content_parts = []
+        tool_call_parts = {}
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content_parts.append(delta.content)
+                writer(delta.content)
+            # Tool calls arrive in fragments keyed by their index
+            for tool_call in getattr(delta, 'tool_calls', None) or []:
+                part = tool_call_parts.setdefault(tool_call.index, {'id': '', 'name': '', 'arguments': ''})
+                if tool_call.id:
+                    part['id'] = tool_call.id
+                if tool_call.function and tool_call.function.name:
+                    part['name'] += tool_call.function.name
+                if tool_call.function and tool_call.function.arguments:
+                    part['arguments'] += tool_call.function.arguments
+
+        content = "".join(content_parts)
+
         # Convert to LangChain AIMessage
-        
-        # Handle tool calls if present
-        if hasattr(response_msg, 'tool_calls') and response_msg.tool_calls:
-            tool_calls = []
-            for tool_call in response_msg.tool_calls:
-                              
-                # Convert Fireworks tool call to LangChain format
-                if hasattr(tool_call, 'function'):
-                    converted_tool_call = {
-                        'name': tool_call.function.name,
-                        'args': json.loads(tool_call.function.arguments),
-                        'id': tool_call.id,
-                        'type': 'tool_call'
-                    }
-                else:
-                    # Already in dict format
-                    converted_tool_call = tool_call
-                
-                tool_calls.append(converted_tool_call)
-            
+        if tool_call_parts:
+            tool_calls = [
+                {
+                    'name': part['name'],
+                    'args': json.loads(part['arguments'] or "{}"),
+                    'id': part['id'],
+                    'type': 'tool_call'
+                }
+                for _, part in sorted(tool_call_parts.items())
+            ]
             ai_message = AIMessage(
-                content=response_msg.content,
+                content=content,
                 tool_calls=tool_calls
             )
         else:
-            ai_message = AIMessage(content=response_msg.content)
+            ai_message = AIMessage(content=content)
         
         return {"messages": [ai_message]}
     
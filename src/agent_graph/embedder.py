@@ -0,0 +1,168 @@
+import threading
+from functools import lru_cache
+from typing import List
+import numpy as np
+from pyprojroot import here
+
+# Doc vectors are the average of the static word vectors (vocab.vectors), so none of these
+# components are needed, not even tok2vec. They are excluded so their weights are never loaded.
+UNUSED_PIPES = ["tok2vec", "tagger", "parser", "senter", "ner", "lemmatizer", "attribute_ruler"]
+
+# Tools may run concurrently; make sure a model is only loaded once.
+_ENCODER_LOCK = threading.Lock()
+
+
+class SpacyEncoder:
+    """
+    Embed text with the document vector of a spaCy model.
+
+    Attributes:
+        nlp (spacy.Language): spaCy pipeline reduced to the tokenizer and the static word vectors.
+    """
+
+    def __init__(self, model_name: str) -> None:
+        """
+        Load the spaCy model.
+
+        Args:
+            model_name (str): Name of the spaCy model (e.g., "en_core_web_lg").
+        """
+        import spacy
+
+        self.nlp = spacy.load(model_name, exclude=UNUSED_PIPES)
+
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Embed a single text.
+
+        Args:
+            text (str): Text to embed.
+
+        Returns:
+            np.ndarray: Document vector of the text.
+        """
+        return self.nlp(text).vector
+
+    def encode_batch(self, texts: List[str], batch_size: int = 32, n_process: int = 1) -> np.ndarray:
+        """
+        Embed several texts in one pass through `nlp.pipe`.
+
+        The document vectors are written into a single preallocated float32 matrix.
+
+        Args:
+            texts (List[str]): Texts to embed.
+            batch_size (int): Number of texts processed per batch.
+            n_process (int): Number of worker processes used by `nlp.pipe`.
+
+        Returns:
+            np.ndarray: `(len(texts), dim)` matrix with one document vector per row.
+        """
+        embeddings = np.empty((len(texts), self.nlp.vocab.vectors_length), dtype=np.float32)
+        for i, doc in enumerate(self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)):
+            embeddings[i] = doc.vector
+        return embeddings
+
+
+class OnnxEncoder:
+    """
+    Embed text with a sentence-transformers model exported to ONNX (e.g., a quantized all-MiniLM-L6-v2).
+
+    The model directory must contain `model.onnx` and the matching `tokenizer.json`. Token embeddings
+    are mean-pooled over the attention mask and L2-normalized, as done by sentence-transformers.
+
+    Attributes:
+        session (onnxruntime.InferenceSession): ONNX Runtime session running the encoder on CPU.
+        tokenizer (tokenizers.Tokenizer): Fast tokenizer matching the exported model.
+    """
+
+    def __init__(self, model_dir: str) -> None:
+        """
+        Load the ONNX model and its tokenizer.
+
+        Args:
+            model_dir (str): Directory (relative to the project root or absolute) with `model.onnx` and `tokenizer.json`.
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = here(model_dir)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path / "model.onnx"), sess_options=options, providers=["CPUExecutionProvider"])
+        self.tokenizer = Tokenizer.from_file(str(model_path / "tokenizer.json"))
+        self.tokenizer.enable_padding()
+        self.tokenizer.enable_truncation(max_length=256)
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Embed a single text.
+
+        Args:
+            text (str): Text to embed.
+
+        Returns:
+            np.ndarray: Normalized sentence embedding.
+        """
+        return self.encode_batch([text])[0]
+
+    def encode_batch(self, texts: List[str], batch_size: int = 32, n_process: int = 1) -> np.ndarray:
+        """
+        Embed several texts, running the model once per batch.
+
+        Args:
+            texts (List[str]): Texts to embed.
+            batch_size (int): Number of texts passed to the model per run.
+            n_process (int): Ignored; ONNX Runtime already parallelizes each run across threads.
+
+        Returns:
+            np.ndarray: `(len(texts), dim)` matrix with one normalized sentence embedding per row.
+        """
+        embeddings = None
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            inputs = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": mask,
+                "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            token_embeddings = self.session.run(
+                None, {k: v for k, v in inputs.items() if k in self._input_names})[0]
+            weights = mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+            if embeddings is None:
+                embeddings = np.empty((len(texts), pooled.shape[1]), dtype=np.float32)
+            embeddings[start:start + len(pooled)] = pooled
+        if embeddings is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return embeddings
+
+
+def load_encoder(backend: str, model_name: str):
+    """
+    Load an encoder once per process and share it between tools.
+
+    Args:
+        backend (str): Either "spacy" or "onnx".
+        model_name (str): spaCy model name, or the directory of the ONNX model.
+
+    Returns:
+        SpacyEncoder | OnnxEncoder: The loaded encoder.
+
+    Raises:
+        ValueError: If the backend is not supported.
+    """
+    with _ENCODER_LOCK:
+        return _load_encoder(backend, model_name)
+
+
+@lru_cache(maxsize=None)
+def _load_encoder(backend: str, model_name: str):
+    if backend == "spacy":
+        return SpacyEncoder(model_name)
+    if backend == "onnx":
+        return OnnxEncoder(model_name)
+    raise ValueError(f"Unknown embedding backend: {backend}")
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from functools import lru_cache, wraps
+from typing import Callable, Optional
+from agent_graph.load_tools_config import LoadToolsConfig
+
+TOOLS_CFG = LoadToolsConfig()
+
+# Tools may run concurrently; make sure each instance is only built once.
+_CACHE_LOCK = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for exact matching: case-folded, with runs of whitespace collapsed.
+
+    Args:
+        query (str): The tool's input query.
+
+    Returns:
+        str: The normalized query.
+    """
+    return " ".join(query.casefold().split())
+
+
+class ExactCache:
+    """
+    A persistent cache for tool responses keyed by the tool name and the normalized query.
+
+    Unlike `SemanticCache`, a hit requires the same query (up to case and whitespace), so
+    questions that differ only in an entity, a year or a number never share an answer. No
+    embedding model is needed, which keeps it cheap for tools that don't embed anything.
+
+    Attributes:
+        db_path (str): Path of the SQLite file holding the cached responses.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Initialize the ExactCache and create its table if needed.
+
+        Args:
+            db_path (str): Path of the SQLite file holding the cached responses.
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "tool_name TEXT NOT NULL, query TEXT NOT NULL, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (tool_name, query))"
+            )
+
+    def _connect(self) -> "closing[sqlite3.Connection]":
+        # Tools run in worker threads, so every call opens its own short-lived connection
+        return closing(sqlite3.connect(self.db_path, timeout=10))
+
+    def get(self, tool_name: str, query: str, ttl_seconds: float) -> Optional[str]:
+        """
+        Return the cached response for a query if it is younger than `ttl_seconds`.
+
+        Args:
+            tool_name (str): Name of the tool the response belongs to.
+            query (str): The tool's input query.
+            ttl_seconds (float): Maximum age of a cached response in seconds.
+
+        Returns:
+            Optional[str]: The cached response, or None on a cache miss.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response FROM responses WHERE tool_name = ? AND query = ? AND created_at >= ?",
+                (tool_name, normalize_query(query), time.time() - ttl_seconds)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, tool_name: str, query: str, response: str, ttl_seconds: float) -> None:
+        """
+        Store a tool response and evict the tool's entries older than `ttl_seconds`.
+
+        Args:
+            tool_name (str): Name of the tool the response belongs to.
+            query (str): The tool's input query.
+            response (str): The tool response to cache.
+            ttl_seconds (float): Maximum age of a cached response in seconds.
+        """
+        now = time.time()
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM responses WHERE tool_name = ? AND created_at < ?",
+                         (tool_name, now - ttl_seconds))
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                         (tool_name, normalize_query(query), response, now))
+
+
+def _get_cache() -> ExactCache:
+    """
+    Create the process-wide ExactCache from the tools config.
+
+    Returns:
+        ExactCache: Shared cache instance.
+    """
+    with _CACHE_LOCK:
+        return _build_cache()
+
+
+@lru_cache(maxsize=1)
+def _build_cache() -> ExactCache:
+    return ExactCache(TOOLS_CFG.exact_cache_path)
+
+
+def exact_cache(tool_name: str, ttl_seconds: Optional[float] = None) -> Callable:
+    """
+    Decorate a single-argument tool function with an exact-match response cache.
+
+    The decorator must be applied below `@tool` so that LangChain still sees the
+    original signature and docstring.
+
+    Args:
+        tool_name (str): Name under which the tool's responses are cached.
+        ttl_seconds (Optional[float]): Time-to-live of a cached response. Defaults to the
+            configured semantic cache `ttl_days`.
+
+    Returns:
+        Callable: The decorator.
+    """
+    ttl = TOOLS_CFG.semantic_cache_ttl_days * 24 * 60 * 60 if ttl_seconds is None else ttl_seconds
+
+    def decorator(func: Callable[[str], str]) -> Callable[[str], str]:
+        @wraps(func)
+        def wrapper(query: str) -> str:
+            cache = _get_cache()
+            cached = cache.get(tool_name, query, ttl)
+            if cached is not None:
+                return cached
+            response = func(query)
+            cache.put(tool_name, query, response, ttl)
+            return response
+        return wrapper
+    return decorator
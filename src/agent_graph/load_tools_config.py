@@ -17,6 +17,7 @@ class LoadToolsConfig:
     - Travel SQL Agent
     - Chinook SQL Agent
     - Internet Search (Tavily)
+    - Semantic cache for tool responses
     - Primary agent settings
     - Graph configs
 
@@ -46,11 +47,14 @@ class LoadToolsConfig:
         # Internet Search config
         self.tavily_search_max_results = int(
             app_config["tavily_search_api"]["tavily_search_max_results"])
+        self.tavily_search_cache_ttl_minutes = float(
+            app_config["tavily_search_api"]["cache_ttl_minutes"])
 
         # Swiss Airline Policy RAG configs
         self.policy_rag_llm = app_config["swiss_airline_policy_rag"]["llm"]
         self.policy_rag_llm_temperature = float(
             app_config["swiss_airline_policy_rag"]["llm_temperature"])
+        self.policy_rag_embedding_backend = app_config["swiss_airline_policy_rag"]["embedding_backend"]
         self.policy_rag_embedding_model = app_config["swiss_airline_policy_rag"]["embedding_model"]
         self.policy_rag_vectordb_directory = str(here(
             app_config["swiss_airline_policy_rag"]["vectordb"]))  # needs to be strin for summation in chromadb backend: self._settings.require("persist_directory") + "/chroma.sqlite3"
@@ -60,11 +64,13 @@ class LoadToolsConfig:
         self.policy_rag_chunk_size = app_config["swiss_airline_policy_rag"]["chunk_size"]
         self.policy_rag_chunk_overlap = app_config["swiss_airline_policy_rag"]["chunk_overlap"]
         self.policy_rag_collection_name = app_config["swiss_airline_policy_rag"]["collection_name"]
+        self.policy_rag_retrieval_backend = app_config["swiss_airline_policy_rag"]["retrieval_backend"]
 
         # Stories RAG configs
         self.stories_rag_llm = app_config["stories_rag"]["llm"]
         self.stories_rag_llm_temperature = float(
             app_config["stories_rag"]["llm_temperature"])
+        self.stories_rag_embedding_backend = app_config["stories_rag"]["embedding_backend"]
         self.stories_rag_embedding_model = app_config["stories_rag"]["embedding_model"]
         self.stories_rag_vectordb_directory = str(here(
             app_config["stories_rag"]["vectordb"]))  # needs to be strin for summation in chromadb backend: self._settings.require("persist_directory") + "/chroma.sqlite3"
@@ -74,6 +80,7 @@ class LoadToolsConfig:
         self.stories_rag_chunk_size = app_config["stories_rag"]["chunk_size"]
         self.stories_rag_chunk_overlap = app_config["stories_rag"]["chunk_overlap"]
         self.stories_rag_collection_name = app_config["stories_rag"]["collection_name"]
+        self.stories_rag_retrieval_backend = app_config["stories_rag"]["retrieval_backend"]
 
         # Travel SQL Agent configs
         self.travel_sqldb_directory = str(here(
@@ -90,6 +97,26 @@ class LoadToolsConfig:
         self.chinook_sqlagent_llm_temperature = float(
             app_config["chinook_sqlagent_configs"]["llm_temperature"])
         self.chinook_sqlagent_llm_api_key = os.getenv("GEMINI_API_KEY")
+        self.chinook_sqlagent_embedding_backend = app_config["chinook_sqlagent_configs"]["embedding_backend"]
+        self.chinook_sqlagent_embedding_model = app_config["chinook_sqlagent_configs"]["embedding_model"]
+        self.chinook_sqlagent_category_margin = float(
+            app_config["chinook_sqlagent_configs"]["category_margin"])
+        self.chinook_sqlagent_category_margin_max = float(
+            app_config["chinook_sqlagent_configs"]["category_margin_max"])
+
+        # Semantic cache configs
+        self.semantic_cache_vectordb_directory = str(here(
+            app_config["semantic_cache"]["vectordb"]))
+        self.semantic_cache_collection_name = app_config["semantic_cache"]["collection_name"]
+        self.embedding_cache_collection_name = app_config["semantic_cache"]["embedding_cache_collection_name"]
+        self.semantic_cache_embedding_backend = app_config["semantic_cache"]["embedding_backend"]
+        self.semantic_cache_embedding_model = app_config["semantic_cache"]["embedding_model"]
+        self.semantic_cache_distance_threshold = float(
+            app_config["semantic_cache"]["distance_threshold"])
+        self.semantic_cache_ttl_days = float(
+            app_config["semantic_cache"]["ttl_days"])
+        self.exact_cache_path = str(here(
+            app_config["semantic_cache"]["exact_cache_path"]))
 
         # Graph configs
         self.thread_id = str(
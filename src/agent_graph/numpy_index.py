@@ -0,0 +1,120 @@
+import json
+import os
+from typing import List
+import numpy as np
+
+EMBEDDINGS_FILE = "embeddings.npy"
+INT8_EMBEDDINGS_FILE = "embeddings_int8.npy"
+INT8_SCALE_FILE = "embeddings_int8_scale.npy"
+DOCUMENTS_FILE = "documents.json"
+# Rows of the int8 matrix converted to float32 at a time; small enough for the block to stay in cache
+INT8_BLOCK_ROWS = 1024
+
+
+class NumpyIndex:
+    """
+    Exact cosine-similarity search over a memory-mapped embedding matrix.
+
+    For small corpora a single matrix-vector product (BLAS) is faster than walking an HNSW graph
+    and always returns the true nearest neighbours. The index exposes the subset of Chroma's
+    `Collection.query` interface used by the RAG tools, so it can be used in place of a collection.
+
+    With `quantized=True` the int8 copy of the matrix is used instead, a quarter of the size
+    of the float32 one on disk and in the page cache. Each dimension d is stored as
+    `round(x_d / scale_d)`, so a similarity is computed as the dot product of `query * scale`
+    with the int8 rows. The rows are converted to float32 block by block, which keeps the
+    query time close to the float32 index instead of materializing a float32 copy of the matrix.
+
+    Attributes:
+        matrix (np.ndarray): Memory-mapped `(N, d)` matrix of L2-normalized embeddings (float32 or int8).
+        scale (Optional[np.ndarray]): Per-dimension dequantization scale, or None for the float32 matrix.
+        documents (List[str]): Document texts aligned with the rows of `matrix`.
+    """
+
+    def __init__(self, index_dir: str, quantized: bool = False) -> None:
+        """
+        Load the index written by `NumpyIndex.save`.
+
+        Args:
+            index_dir (str): Directory containing the embedding matrices and `documents.json`.
+            quantized (bool): Search the int8 matrix instead of the float32 one.
+        """
+        if quantized:
+            self.matrix = np.load(os.path.join(index_dir, INT8_EMBEDDINGS_FILE), mmap_mode="r")
+            self.scale = np.load(os.path.join(index_dir, INT8_SCALE_FILE))
+        else:
+            self.matrix = np.load(os.path.join(index_dir, EMBEDDINGS_FILE), mmap_mode="r")
+            self.scale = None
+        with open(os.path.join(index_dir, DOCUMENTS_FILE), encoding="utf-8") as f:
+            self.documents = json.load(f)
+
+    @staticmethod
+    def exists(index_dir: str) -> bool:
+        """
+        Check whether `index_dir` holds all files written by `NumpyIndex.save`.
+
+        Args:
+            index_dir (str): Directory to check.
+
+        Returns:
+            bool: True if both the float32 and int8 indexes can be loaded from `index_dir`.
+        """
+        return all(os.path.exists(os.path.join(index_dir, name))
+                   for name in (EMBEDDINGS_FILE, INT8_EMBEDDINGS_FILE, INT8_SCALE_FILE, DOCUMENTS_FILE))
+
+    @staticmethod
+    def save(index_dir: str, embeddings, documents: List[str], normalized: bool = False) -> None:
+        """
+        Write the normalized embedding matrix, its int8 quantization and the documents to `index_dir`.
+
+        Args:
+            index_dir (str): Output directory (usually the Chroma vectordb directory).
+            embeddings (np.ndarray | List[np.ndarray]): One embedding per document.
+            documents (List[str]): Document texts.
+            normalized (bool): Whether the rows are already L2-normalized, which skips normalizing a copy.
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if not normalized:
+            matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        np.save(os.path.join(index_dir, EMBEDDINGS_FILE), matrix)
+        # Symmetric per-dimension quantization to [-127, 127]
+        scale = np.maximum(np.abs(matrix).max(axis=0, initial=0.0), 1e-12) / 127
+        np.save(os.path.join(index_dir, INT8_EMBEDDINGS_FILE), np.round(matrix / scale).astype(np.int8))
+        np.save(os.path.join(index_dir, INT8_SCALE_FILE), scale.astype(np.float32))
+        with open(os.path.join(index_dir, DOCUMENTS_FILE), "w", encoding="utf-8") as f:
+            json.dump(documents, f)
+
+    def query(self, query_embeddings: list, n_results: int, include: List[str] = ("documents",)) -> dict:
+        """
+        Return the `n_results` most similar documents for each query embedding.
+
+        Args:
+            query_embeddings (list): Query embeddings.
+            n_results (int): Number of documents to return per query.
+            include (List[str]): Accepted for compatibility with Chroma; documents and distances are returned.
+
+        Returns:
+            dict: Chroma-style result with `documents` and cosine `distances`, one list per query.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        if self.scale is None:
+            scores = queries @ self.matrix.T
+        else:
+            queries = queries * self.scale
+            scores = np.empty((len(queries), len(self.matrix)), dtype=np.float32)
+            for start in range(0, len(self.matrix), INT8_BLOCK_ROWS):
+                block = self.matrix[start:start + INT8_BLOCK_ROWS].astype(np.float32)
+                np.matmul(queries, block.T, out=scores[:, start:start + INT8_BLOCK_ROWS])
+        k = min(n_results, scores.shape[1])
+        documents, distances = [], []
+        for row in scores:
+            if k == 0:
+                documents.append([])
+                distances.append([])
+                continue
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top])]
+            documents.append([self.documents[i] for i in top])
+            distances.append((1.0 - row[top]).tolist())
+        return {"documents": documents, "distances": distances}
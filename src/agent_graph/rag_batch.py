@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import Future
+from contextvars import ContextVar
+from typing import List
+
+# Set by BasicToolNode while it runs several tool calls of one turn in parallel.
+BATCH_WINDOW: ContextVar[bool] = ContextVar("rag_batch_window", default=False)
+
+
+class BatchRAG:
+    """
+    Combine concurrent lookups against one Chroma collection into a single batched query.
+
+    Inside a batch window, the first caller waits briefly for lookups issued by the other
+    tool calls of the same turn, then sends all pending embeddings in one `collection.query`
+    and hands each caller its own results. Outside a batch window the collection is queried
+    directly.
+
+    Attributes:
+        collection (chromadb.Collection): Chroma collection to query.
+        k (int): Number of nearest documents to retrieve per lookup.
+        window (float): Seconds the first caller waits for further lookups.
+    """
+
+    def __init__(self, collection, k: int, window: float = 0.005) -> None:
+        """
+        Initialize the BatchRAG with its collection and batching window.
+
+        Args:
+            collection (chromadb.Collection): Chroma collection to query.
+            k (int): Number of nearest documents to retrieve per lookup.
+            window (float): Seconds the first caller waits for further lookups.
+        """
+        self.collection = collection
+        self.k = k
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = []
+
+    def query(self, embedding) -> List[str]:
+        """
+        Retrieve the top-k documents for a query embedding.
+
+        Args:
+            embedding (np.ndarray): Embedding of the query.
+
+        Returns:
+            List[str]: The matching documents, closest first.
+        """
+        if not BATCH_WINDOW.get():
+            return self._query([embedding])[0]
+
+        future = Future()
+        with self._lock:
+            self._pending.append((embedding, future))
+            leader = len(self._pending) == 1
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                batch, self._pending = self._pending, []
+            try:
+                documents = self._query([e for e, _ in batch])
+            except Exception as e:
+                for _, pending in batch:
+                    pending.set_exception(e)
+            else:
+                for (_, pending), docs in zip(batch, documents):
+                    pending.set_result(docs)
+        return future.result()
+
+    def _query(self, embeddings: list) -> List[List[str]]:
+        results = self.collection.query(
+            query_embeddings=embeddings,
+            n_results=self.k,
+            include=["documents"]
+        )
+        return results["documents"]
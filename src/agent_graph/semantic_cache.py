@@ -0,0 +1,279 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from functools import lru_cache, wraps
+from typing import Callable, Dict, Optional
+import numpy as np
+from agent_graph.embedder import load_encoder
+from agent_graph.load_tools_config import LoadToolsConfig
+
+TOOLS_CFG = LoadToolsConfig()
+
+# Tools may run concurrently; make sure each instance is only built once.
+_COLLECTION_LOCK = threading.Lock()
+_CACHE_LOCK = threading.Lock()
+
+
+def model_collection_name(collection_name: str, embedding_backend: str, embedding_model: str) -> str:
+    """
+    Suffix a collection name with a hash of the embedding backend and model.
+
+    A Chroma collection's dimensionality is fixed by its first insert, so embeddings of
+    different models (e.g., 300-d spaCy and 384-d ONNX) must live in separate collections.
+
+    Args:
+        collection_name (str): Base collection name.
+        embedding_backend (str): Embedding backend, either "spacy" or "onnx".
+        embedding_model (str): spaCy model name or ONNX model directory.
+
+    Returns:
+        str: Collection name specific to the backend and model.
+    """
+    model_hash = hashlib.blake2b(f"{embedding_backend}\0{embedding_model}".encode(), digest_size=4).hexdigest()
+    return f"{collection_name}-{model_hash}"
+
+
+def _get_embedding_collection(embedding_backend: str, embedding_model: str) -> "chromadb.Collection":
+    """
+    Open the Chroma collection mirroring the query embeddings of one model across processes.
+
+    Args:
+        embedding_backend (str): Embedding backend, either "spacy" or "onnx".
+        embedding_model (str): spaCy model name or ONNX model directory.
+
+    Returns:
+        chromadb.Collection: Collection keyed by query hash.
+    """
+    with _COLLECTION_LOCK:
+        return _build_embedding_collection(embedding_backend, embedding_model)
+
+
+@lru_cache(maxsize=None)
+def _build_embedding_collection(embedding_backend: str, embedding_model: str) -> "chromadb.Collection":
+    import chromadb
+
+    client = chromadb.PersistentClient(path=TOOLS_CFG.semantic_cache_vectordb_directory)
+    return client.get_or_create_collection(name=model_collection_name(
+        TOOLS_CFG.embedding_cache_collection_name, embedding_backend, embedding_model))
+
+
+def embed_query(embedding_backend: str, embedding_model: str, query: str) -> np.ndarray:
+    """
+    Embed a query, reusing the embedding of an identical earlier query.
+
+    Embeddings are kept in an in-process LRU cache and mirrored into a persistent Chroma
+    collection per backend and model, both keyed by a hash of the backend, model and query text.
+    Persisted embeddings older than the semantic cache `ttl_days` are evicted on every insert.
+
+    Args:
+        embedding_backend (str): Embedding backend, either "spacy" or "onnx".
+        embedding_model (str): spaCy model name or ONNX model directory.
+        query (str): The query to embed.
+
+    Returns:
+        np.ndarray: Read-only float32 embedding of the query.
+    """
+    query_hash = hashlib.blake2b(
+        f"{embedding_backend}\0{embedding_model}\0{query}".encode(), digest_size=16).hexdigest()
+    return _embed(query_hash, embedding_backend, embedding_model, query)
+
+
+@lru_cache(maxsize=1024)
+def _embed(query_hash: str, embedding_backend: str, embedding_model: str, query: str) -> np.ndarray:
+    collection = _get_embedding_collection(embedding_backend, embedding_model)
+    stored = collection.get(ids=[query_hash], include=["embeddings"])
+    if stored["ids"]:
+        embedding = np.asarray(stored["embeddings"][0], dtype=np.float32)
+    else:
+        encoder = load_encoder(embedding_backend, embedding_model)
+        embedding = np.asarray(encoder.encode(query), dtype=np.float32)
+        now = time.time()
+        collection.delete(where={"created_at": {"$lt": now - TOOLS_CFG.semantic_cache_ttl_days * 24 * 60 * 60}})
+        collection.upsert(ids=[query_hash], embeddings=[embedding], metadatas=[{"created_at": now}])
+    # The array is shared between callers through the LRU cache
+    embedding.setflags(write=False)
+    return embedding
+
+
+class SemanticCache:
+    """
+    A persistent semantic cache for tool responses backed by a Chroma collection.
+
+    Each entry stores the embedding of a tool's input query together with the tool name,
+    the response, its creation time and an optional scope (e.g., the vector database the
+    response was retrieved from). A lookup returns the stored response when a previous query
+    of the same tool and scope lies within the given cosine distance and is younger than the
+    configured TTL.
+
+    Attributes:
+        collection (chromadb.Collection): Chroma collection holding the cached responses.
+        embedding_backend (str): Embedding backend used to embed the queries.
+        embedding_model (str): spaCy model name or ONNX model directory used to embed the queries.
+        ttl_seconds (float): Time-to-live of a cache entry in seconds.
+    """
+
+    def __init__(self, vectordb_dir: str, collection_name: str, embedding_backend: str, embedding_model: str,
+                 ttl_days: float) -> None:
+        """
+        Initialize the SemanticCache with its Chroma collection and embedding model.
+
+        Args:
+            vectordb_dir (str): Directory where the cache collection is persisted.
+            collection_name (str): Base name of the Chroma collection used for the cache; it is
+                suffixed per embedding backend and model.
+            embedding_backend (str): Embedding backend, either "spacy" or "onnx".
+            embedding_model (str): spaCy model name or ONNX model directory used for embeddings.
+            ttl_days (float): Number of days a cached response stays valid.
+        """
+        import chromadb
+
+        client = chromadb.PersistentClient(path=vectordb_dir)
+        self.collection = client.get_or_create_collection(
+            name=model_collection_name(collection_name, embedding_backend, embedding_model),
+            metadata={"hnsw:space": "cosine"})
+        self.embedding_backend = embedding_backend
+        self.embedding_model = embedding_model
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+
+    def embed(self, query: str) -> np.ndarray:
+        """
+        Embed a query with the configured encoder.
+
+        Args:
+            query (str): The tool's input query.
+
+        Returns:
+            np.ndarray: The query embedding.
+        """
+        return embed_query(self.embedding_backend, self.embedding_model, query)
+
+    def get(self, tool_name: str, embedding: np.ndarray, distance: float,
+            scope: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Return the cached response of the closest non-expired query for the given tool.
+
+        Args:
+            tool_name (str): Name of the tool the response belongs to.
+            embedding (np.ndarray): Embedding of the incoming query.
+            distance (float): Maximum cosine distance for a cache hit.
+            scope (Optional[Dict[str, str]]): Metadata the cached entry must match.
+
+        Returns:
+            Optional[str]: The cached response, or None on a cache miss.
+        """
+        if self.collection.count() == 0:
+            return None
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=1,
+            where={"$and": [
+                {"tool_name": tool_name},
+                {"created_at": {"$gte": time.time() - self.ttl_seconds}},
+                *({key: value} for key, value in (scope or {}).items()),
+            ]},
+            include=["documents", "distances"]
+        )
+        if results["ids"][0] and results["distances"][0][0] <= distance:
+            return results["documents"][0][0]
+        return None
+
+    def put(self, tool_name: str, query: str, embedding: np.ndarray, response: str,
+            scope: Optional[Dict[str, str]] = None) -> None:
+        """
+        Store a tool response and evict entries older than the TTL.
+
+        Args:
+            tool_name (str): Name of the tool the response belongs to.
+            query (str): The tool's input query.
+            embedding (np.ndarray): Embedding of the query.
+            response (str): The tool response to cache.
+            scope (Optional[Dict[str, str]]): Metadata stored with the entry and matched by `get`.
+        """
+        now = time.time()
+        self.collection.delete(where={"created_at": {"$lt": now - self.ttl_seconds}})
+        self.collection.add(
+            ids=[uuid.uuid4().hex],
+            documents=[response],
+            embeddings=[embedding],
+            metadatas=[{"tool_name": tool_name, "query": query, "created_at": now, **(scope or {})}]
+        )
+
+
+def _get_cache() -> SemanticCache:
+    """
+    Create the process-wide SemanticCache from the tools config.
+
+    Returns:
+        SemanticCache: Shared cache instance.
+    """
+    with _CACHE_LOCK:
+        return _build_cache()
+
+
+@lru_cache(maxsize=1)
+def _build_cache() -> SemanticCache:
+    return SemanticCache(
+        vectordb_dir=TOOLS_CFG.semantic_cache_vectordb_directory,
+        collection_name=TOOLS_CFG.semantic_cache_collection_name,
+        embedding_backend=TOOLS_CFG.semantic_cache_embedding_backend,
+        embedding_model=TOOLS_CFG.semantic_cache_embedding_model,
+        ttl_days=TOOLS_CFG.semantic_cache_ttl_days)
+
+
+def invalidate_vectordb(vectordb_dir: str) -> None:
+    """
+    Delete the cached responses retrieved from a vector database, e.g. after it was rebuilt.
+
+    Args:
+        vectordb_dir (str): Absolute path of the vector database, as passed in the `vectordb` scope.
+    """
+    if not os.path.exists(TOOLS_CFG.semantic_cache_vectordb_directory):
+        return
+    import chromadb
+
+    client = chromadb.PersistentClient(path=TOOLS_CFG.semantic_cache_vectordb_directory)
+    for collection in client.list_collections():
+        # One cache collection per embedding model, see model_collection_name
+        if collection.name.startswith(f"{TOOLS_CFG.semantic_cache_collection_name}-"):
+            collection.delete(where={"vectordb": vectordb_dir})
+
+
+def semantic_cache(tool_name: str, distance: Optional[float] = None,
+                   scope: Optional[Dict[str, str]] = None) -> Callable:
+    """
+    Decorate a single-argument tool function with a semantic response cache.
+
+    The decorator must be applied below `@tool` so that LangChain still sees the
+    original signature and docstring.
+
+    Args:
+        tool_name (str): Name under which the tool's responses are cached.
+        distance (Optional[float]): Maximum cosine distance for a cache hit. Defaults
+            to the configured `distance_threshold`.
+        scope (Optional[Dict[str, str]]): Identity of the data the responses come from. RAG tools
+            pass `vectordb`, `collection` and `retrieval_backend`, so changing any of them misses
+            the cache and `invalidate_vectordb` can drop the entries of a rebuilt database.
+
+    Returns:
+        Callable: The decorator.
+    """
+    max_distance = TOOLS_CFG.semantic_cache_distance_threshold if distance is None else distance
+
+    def decorator(func: Callable[[str], str]) -> Callable[[str], str]:
+        @wraps(func)
+        def wrapper(query: str) -> str:
+            cache = _get_cache()
+            embedding = cache.embed(query)
+            # With spaCy, queries without any known word vectors embed to zero and can't be compared.
+            if not embedding.any():
+                return func(query)
+            cached = cache.get(tool_name, embedding, max_distance, scope)
+            if cached is not None:
+                return cached
+            response = func(query)
+            cache.put(tool_name, query, embedding, response, scope)
+            return response
+        return wrapper
+    return decorator
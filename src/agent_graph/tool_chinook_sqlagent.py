@@ -1,17 +1,22 @@
+import threading
 from typing import List
-from langchain_google_genai import ChatGoogleGenerativeAI
+from functools import lru_cache
+import numpy as np
 from pydantic import BaseModel, Field
-from langchain.chains.openai_tools import create_extraction_chain_pydantic
-from langchain_community.utilities import SQLDatabase
-from langchain.chains import create_sql_query_chain
 from langchain_core.runnables import RunnablePassthrough, RunnableLambda
 from operator import itemgetter
 from langchain_core.tools import tool
 from agent_graph.load_tools_config import LoadToolsConfig
+from agent_graph.embedder import load_encoder
+from agent_graph.semantic_cache import embed_query
+from agent_graph.exact_cache import exact_cache
 from .extract_sql_query import extract_sql_query
 
 TOOLS_CFG = LoadToolsConfig()
 
+# Tools may run concurrently; make sure each instance is only built once.
+_AGENT_LOCK = threading.Lock()
+
 
 class Table(BaseModel):
     """
@@ -23,34 +28,141 @@ class Table(BaseModel):
     name: str = Field(description="Name of table in SQL database.")
 
 
+# SQL tables behind each category the classifier can return
+_CATEGORY_TABLES = {
+    "Music": (
+        "Album",
+        "Artist",
+        "Genre",
+        "MediaType",
+        "Playlist",
+        "PlaylistTrack",
+        "Track",
+    ),
+    "Business": ("Customer", "Employee", "Invoice", "InvoiceLine"),
+}
+
+
 def get_tables(categories: List[Table]) -> List[str]:
     """
     Map high-level category names to their corresponding SQL table names.
 
+    Tables are deduplicated while keeping their order, so repeated categories
+    don't inflate the schema passed to the query prompt.
+
     Args:
         categories (List[Table]): A list of `Table` objects containing category names.
 
     Returns:
         List[str]: List of SQL table names relevant to the provided categories.
     """
-    tables = []
-    for category in categories:
-        if category.name == "Music":
-            tables.extend(
-                [
-                    "Album",
-                    "Artist",
-                    "Genre",
-                    "MediaType",
-                    "Playlist",
-                    "PlaylistTrack",
-                    "Track",
-                ]
-            )
-        elif category.name == "Business":
-            tables.extend(
-                ["Customer", "Employee", "Invoice", "InvoiceLine"])
-    return tables
+    return list(dict.fromkeys(
+        table for category in categories for table in _CATEGORY_TABLES.get(category.name, ())))
+
+
+# Example questions per category, embedded once to build the category prototypes
+_CATEGORY_EXAMPLES = {
+    "Music": [
+        "Which artists have the most albums?",
+        "List all tracks in the Rock genre.",
+        "What are the longest songs in the playlist?",
+        "How many tracks use the MPEG audio file media type?",
+        "Show the albums released by AC/DC.",
+    ],
+    "Business": [
+        "Which customers spent the most money?",
+        "What are the total sales per country?",
+        "List all invoices from 2010.",
+        "Which employee supports the most customers?",
+        "What is the average invoice total per customer?",
+    ],
+}
+
+# Questions that need the tables of both categories. The classifier widens its margin until
+# none of them is assigned to a single category, up to the configured category_margin_max.
+_MIXED_EXAMPLES = [
+    "Which customers bought the most Rock tracks?",
+    "What are the total sales per genre?",
+    "Which artist generated the most revenue?",
+    "List the invoices that contain tracks from the album Let There Be Rock.",
+    "Which employee's customers purchased the most jazz songs?",
+]
+
+
+class CategoryClassifier:
+    """
+    Embedding-based classifier picking the Chinook category of a question without an LLM call.
+
+    Each category is represented by the normalized mean embedding of a few example questions.
+    A question is assigned to the most similar category only when it beats the runner-up by at
+    least `margin` (cosine similarity); otherwise all categories are returned, so questions
+    spanning several categories get every table they may need. The margin is raised above the
+    similarity gap of every question in `_MIXED_EXAMPLES`, which must map to all categories,
+    but capped at `max_margin`.
+
+    Attributes:
+        embedding_backend (str): Embedding backend used for questions and prototypes.
+        embedding_model (str): spaCy model name or ONNX model directory.
+        margin (float): Minimum similarity gap between the best and second-best category,
+            after calibration on the mixed-category examples and capping at `max_margin`.
+        names (List[str]): Category names, aligned with the rows of `prototypes`.
+        prototypes (np.ndarray): Normalized prototype embedding per category.
+    """
+
+    def __init__(self, embedding_backend: str, embedding_model: str, margin: float, max_margin: float) -> None:
+        """
+        Build the category prototypes.
+
+        Args:
+            embedding_backend (str): Embedding backend, either "spacy" or "onnx".
+            embedding_model (str): spaCy model name or ONNX model directory.
+            margin (float): Minimum similarity gap required to trust the classification.
+            max_margin (float): Upper bound for the calibrated margin.
+        """
+        self.embedding_backend = embedding_backend
+        self.embedding_model = embedding_model
+        encoder = load_encoder(embedding_backend, embedding_model)
+        self.names = list(_CATEGORY_EXAMPLES)
+        prototypes = []
+        for name in self.names:
+            vectors = encoder.encode_batch(_CATEGORY_EXAMPLES[name])
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            prototypes.append(vectors.mean(axis=0))
+        self.prototypes = np.stack(prototypes)
+        self.prototypes /= np.maximum(np.linalg.norm(self.prototypes, axis=1, keepdims=True), 1e-12)
+
+        # Make sure every known mixed-category question falls inside the margin
+        mixed = encoder.encode_batch(_MIXED_EXAMPLES)
+        mixed /= np.maximum(np.linalg.norm(mixed, axis=1, keepdims=True), 1e-12)
+        mixed_scores = np.sort(mixed @ self.prototypes.T, axis=1)
+        mixed_gap = float((mixed_scores[:, -1] - mixed_scores[:, -2]).max()) + 1e-6
+        self.margin = min(max(margin, mixed_gap), max_margin)
+        print(f"Chinook category margin: {self.margin:.4f} (configured {margin}, mixed examples need {mixed_gap:.4f})")
+        if mixed_gap > max_margin:
+            print(f"Warning: the mixed-category examples need a margin of {mixed_gap:.4f}, above the cap of "
+                  f"{max_margin}; {embedding_model} separates the categories poorly and some mixed "
+                  f"questions will only get the tables of one category.")
+
+    def classify(self, question: str) -> List[str]:
+        """
+        Return the categories whose tables a question needs.
+
+        Args:
+            question (str): User's natural language question.
+
+        Returns:
+            List[str]: The single clearly matching category, or all categories when the
+                question is ambiguous or can't be embedded.
+        """
+        embedding = embed_query(self.embedding_backend, self.embedding_model, question)
+        norm = np.linalg.norm(embedding)
+        if norm == 0:
+            return list(self.names)
+        scores = self.prototypes @ (embedding / norm)
+        second, best = np.argsort(scores)[-2:]
+        if scores[best] - scores[second] < self.margin:
+            return list(self.names)
+        return [self.names[best]]
 
 
 class ChinookSQLAgent:
@@ -58,17 +170,21 @@ class ChinookSQLAgent:
     SQL agent for interacting with the Chinook database using LLM-generated queries.
 
     This agent uses a language model to:
-    - Identify relevant SQL tables based on the question.
+    - Identify relevant SQL tables based on the question with an embedding classifier
+      (questions that aren't clearly about one category get the tables of all categories).
     - Construct a SQL query targeting only those tables.
     - Clean and return the final SQL query string.
 
     Attributes:
         sql_agent_llm (ChatGoogleGenerativeAI): Configured LLM for query understanding and generation.
         db (SQLDatabase): SQL database connection for the Chinook DB.
+        category_classifier (CategoryClassifier): Embedding classifier selecting the table categories.
         full_chain (Runnable): Execution pipeline for table extraction, query generation, and cleanup.
     """
     
-    def __init__(self, sqldb_directory: str, llm: str, llm_temerature: float, llm_api_key: str) -> None:
+    def __init__(self, sqldb_directory: str, llm: str, llm_temerature: float, llm_api_key: str,
+                 embedding_backend: str, embedding_model: str, category_margin: float,
+                 category_margin_max: float) -> None:
         """
         Initialize the ChinookSQLAgent with database path and LLM configuration.
 
@@ -77,7 +193,16 @@ class ChinookSQLAgent:
             llm (str): Name of the LLM model (e.g., "gemini-2.5-flash").
             llm_temerature (float): Temperature for LLM response variability.
             llm_api_key (str): API key for the LLM service provider.
+            embedding_backend (str): Embedding backend of the category classifier, "spacy" or "onnx".
+            embedding_model (str): spaCy model name or ONNX model directory of the category classifier.
+            category_margin (float): Minimum similarity gap for the classifier to pick a single category.
+            category_margin_max (float): Upper bound for the classifier's calibrated margin.
         """
+        # Imported here so that building the graph doesn't load the SQL/Gemini stack up front
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from langchain_community.utilities import SQLDatabase
+        from langchain.chains import create_sql_query_chain
+
         self.sql_agent_llm = ChatGoogleGenerativeAI(
             model=llm,
             temperature=llm_temerature,
@@ -85,14 +210,13 @@ class ChinookSQLAgent:
         )
         self.db = SQLDatabase.from_uri(f"sqlite:///{sqldb_directory}")
         print(self.db.get_usable_table_names())
-        category_chain_system = """Return the names of the SQL tables that are relevant to the user question. \
-        The tables are:
-
-        Music
-        Business"""
-        category_chain = create_extraction_chain_pydantic(
-            Table, self.sql_agent_llm, system_message=category_chain_system)
-        table_chain = category_chain | get_tables  # noqa
+        self.category_classifier = CategoryClassifier(
+            embedding_backend, embedding_model, category_margin, category_margin_max)
+
+        def select_categories(inputs: dict) -> List[Table]:
+            return [Table(name=name) for name in self.category_classifier.classify(inputs["input"])]
+
+        table_chain = RunnableLambda(select_categories) | get_tables  # noqa
         query_chain = create_sql_query_chain(self.sql_agent_llm, self.db)
         clean_query_output = RunnableLambda(extract_sql_query)
         # Convert "question" key to the "input" key expected by current table_chain.
@@ -102,7 +226,41 @@ class ChinookSQLAgent:
             table_names_to_use=table_chain) | query_chain | clean_query_output
 
 
+def _get_agent(sqldb_directory: str, llm: str, llm_temerature: float, llm_api_key: str,
+               embedding_backend: str, embedding_model: str, category_margin: float,
+               category_margin_max: float) -> ChinookSQLAgent:
+    """
+    Build the ChinookSQLAgent once per configuration and reuse it across tool calls.
+
+    Opening the database, introspecting its tables and assembling the LangChain
+    pipelines only needs to happen once per process.
+
+    Returns:
+        ChinookSQLAgent: Cached agent instance for the given configuration.
+    """
+    with _AGENT_LOCK:
+        return _build_agent(sqldb_directory, llm, llm_temerature, llm_api_key,
+                            embedding_backend, embedding_model, category_margin, category_margin_max)
+
+
+@lru_cache(maxsize=1)
+def _build_agent(sqldb_directory: str, llm: str, llm_temerature: float, llm_api_key: str,
+                 embedding_backend: str, embedding_model: str, category_margin: float,
+                 category_margin_max: float) -> ChinookSQLAgent:
+    return ChinookSQLAgent(
+        sqldb_directory=sqldb_directory,
+        llm=llm,
+        llm_temerature=llm_temerature,
+        llm_api_key=llm_api_key,
+        embedding_backend=embedding_backend,
+        embedding_model=embedding_model,
+        category_margin=category_margin,
+        category_margin_max=category_margin_max
+    )
+
+
 @tool
+@exact_cache(tool_name="query_chinook_sqldb")
 def query_chinook_sqldb(query: str) -> str:
     # """Query the Chinook SQL Database. Input should be a search query."""
     """
@@ -114,12 +272,15 @@ def query_chinook_sqldb(query: str) -> str:
     Returns:
         str: Query result after LLM-driven SQL generation and execution.
     """
-    # Create an instance of ChinookSQLAgent
-    agent = ChinookSQLAgent(
-        sqldb_directory=TOOLS_CFG.chinook_sqldb_directory,
-        llm=TOOLS_CFG.chinook_sqlagent_llm,
-        llm_temerature=TOOLS_CFG.chinook_sqlagent_llm_temperature,
-        llm_api_key=TOOLS_CFG.chinook_sqlagent_llm_api_key
+    agent = _get_agent(
+        TOOLS_CFG.chinook_sqldb_directory,
+        TOOLS_CFG.chinook_sqlagent_llm,
+        TOOLS_CFG.chinook_sqlagent_llm_temperature,
+        TOOLS_CFG.chinook_sqlagent_llm_api_key,
+        TOOLS_CFG.chinook_sqlagent_embedding_backend,
+        TOOLS_CFG.chinook_sqlagent_embedding_model,
+        TOOLS_CFG.chinook_sqlagent_category_margin,
+        TOOLS_CFG.chinook_sqlagent_category_margin_max
     )
 
     query = agent.full_chain.invoke({"question": query})
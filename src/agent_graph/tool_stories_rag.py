@@ -1,47 +1,95 @@
+import threading
+from functools import lru_cache
 from langchain_core.tools import tool
-import chromadb
-import spacy
+from agent_graph.embedder import load_encoder
 from agent_graph.load_tools_config import LoadToolsConfig
+from agent_graph.numpy_index import NumpyIndex
+from agent_graph.rag_batch import BatchRAG
+from agent_graph.semantic_cache import embed_query, semantic_cache
 
 TOOLS_CFG = LoadToolsConfig()
 
+# Tools may run concurrently; make sure each instance is only built once.
+_RAG_LOCK = threading.Lock()
+
 
 class StoriesRAGTool:
     """
     A tool for retrieving relevant fictional stories using a Retrieval-Augmented Generation (RAG) approach.
 
-    This tool uses a spaCy embedding model to convert a query into a vector representation, then performs
+    This tool uses an embedding model (spaCy or ONNX) to convert a query into a vector representation, then performs
     similarity search on a Chroma vector database to find the top-k matching stories.
 
     Attributes:
-        embedding_model (str): Name of the spaCy model used for generating embeddings.
+        embedding_backend (str): Embedding backend, either "spacy" or "onnx".
+        embedding_model (str): spaCy model name or ONNX model directory used for generating embeddings.
         vectordb_dir (str): Path to the Chroma vector database directory.
         k (int): Number of nearest results to retrieve.
-        client (chromadb.PersistentClient): Persistent Chroma client instance.
-        collection (chromadb.Collection): Chroma collection used for similarity search.
-        nlp (spacy.Language): Loaded spaCy language model for embedding generation.
+        client (chromadb.PersistentClient): Persistent Chroma client instance (Chroma retrieval only).
+        collection (chromadb.Collection | NumpyIndex): Collection used for similarity search.
+        batcher (BatchRAG): Batches concurrent lookups against the collection.
+        encoder (SpacyEncoder | OnnxEncoder): Loaded encoder for embedding generation.
     """
 
-    def __init__(self, embedding_model: str, vectordb_dir: str, k: int, collection_name: str) -> None:
+    def __init__(self, embedding_backend: str, embedding_model: str, vectordb_dir: str, k: int, collection_name: str,
+                 retrieval_backend: str) -> None:
         """
         Initialize the StoriesRAGTool with embedding model, Chroma DB directory, and search parameters.
 
         Args:
-            embedding_model (str): Name of the spaCy model to use (e.g., "en_core_web_md").
+            embedding_backend (str): Embedding backend, either "spacy" or "onnx".
+            embedding_model (str): spaCy model name (e.g., "en_core_web_md") or ONNX model directory.
             vectordb_dir (str): Directory path where Chroma DB is stored.
             k (int): Number of top similar documents to retrieve.
             collection_name (str): Name of the collection inside Chroma DB to query from.
+            retrieval_backend (str): "chroma" to query the Chroma collection, or "numpy"/"numpy_int8" for
+                exact search over the float32/int8 embedding matrix stored next to it.
         """
+        self.embedding_backend = embedding_backend
         self.embedding_model = embedding_model
         self.vectordb_dir = vectordb_dir
         self.k = k
-        self.client = chromadb.PersistentClient(path=self.vectordb_dir)
-        self.collection = self.client.get_or_create_collection(name=collection_name)
-        self.nlp = spacy.load(self.embedding_model)
-        print("Number of vectors in vectordb:", self.collection.count(), "\n\n")
+        if retrieval_backend in ("numpy", "numpy_int8"):
+            self.collection = NumpyIndex(self.vectordb_dir, quantized=retrieval_backend == "numpy_int8")
+        else:
+            import chromadb
+
+            self.client = chromadb.PersistentClient(path=self.vectordb_dir)
+            self.collection = self.client.get_or_create_collection(name=collection_name)
+        self.encoder = load_encoder(self.embedding_backend, self.embedding_model)
+        self.batcher = BatchRAG(self.collection, self.k)
+
+
+def _get_rag(embedding_backend: str, embedding_model: str, vectordb_dir: str, k: int, collection_name: str,
+             retrieval_backend: str) -> StoriesRAGTool:
+    """
+    Build the StoriesRAGTool once per configuration and reuse it across tool calls.
+
+    Returns:
+        StoriesRAGTool: Cached tool instance holding the encoder and Chroma collection.
+    """
+    with _RAG_LOCK:
+        return _build_rag(embedding_backend, embedding_model, vectordb_dir, k, collection_name, retrieval_backend)
+
+
+@lru_cache(maxsize=1)
+def _build_rag(embedding_backend: str, embedding_model: str, vectordb_dir: str, k: int, collection_name: str,
+               retrieval_backend: str) -> StoriesRAGTool:
+    return StoriesRAGTool(
+        embedding_backend=embedding_backend,
+        embedding_model=embedding_model,
+        vectordb_dir=vectordb_dir,
+        k=k,
+        collection_name=collection_name,
+        retrieval_backend=retrieval_backend)
 
 
 @tool
+@semantic_cache(tool_name="lookup_stories", scope={
+    "vectordb": TOOLS_CFG.stories_rag_vectordb_directory,
+    "collection": TOOLS_CFG.stories_rag_collection_name,
+    "retrieval_backend": TOOLS_CFG.stories_rag_retrieval_backend,
+})
 def lookup_stories(query: str) -> str:
     # """Search among the fictional stories and find the answer to the query. Input should be the query."""
     """
@@ -53,16 +101,14 @@ def lookup_stories(query: str) -> str:
     Returns:
         str: Concatenated results of the top matching story documents.
     """
-    rag_tool = StoriesRAGTool(
-        embedding_model=TOOLS_CFG.stories_rag_embedding_model,
-        vectordb_dir=TOOLS_CFG.stories_rag_vectordb_directory,
-        k=TOOLS_CFG.stories_rag_k,
-        collection_name=TOOLS_CFG.stories_rag_collection_name)
-    query_embedding = rag_tool.nlp(query).vector
-
-    results = rag_tool.collection.query(
-        query_embeddings=[query_embedding],
-        n_results=rag_tool.k,
-        include=["documents", "metadatas"]
-    )
-    return "\n\n".join(results["documents"][0])
+    rag_tool = _get_rag(
+        TOOLS_CFG.stories_rag_embedding_backend,
+        TOOLS_CFG.stories_rag_embedding_model,
+        TOOLS_CFG.stories_rag_vectordb_directory,
+        TOOLS_CFG.stories_rag_k,
+        TOOLS_CFG.stories_rag_collection_name,
+        TOOLS_CFG.stories_rag_retrieval_backend)
+    query_embedding = embed_query(rag_tool.embedding_backend, rag_tool.embedding_model, query)
+
+    documents = rag_tool.batcher.query(query_embedding)
+    return "\n\n".join(documents)
@@ -1,5 +1,7 @@
+import io
 from langchain_community.tools.tavily_search import TavilySearchResults
 from agent_graph.load_tools_config import LoadToolsConfig
+from agent_graph.exact_cache import exact_cache
 from langchain_core.tools import tool
 
 TOOLS_CFG = LoadToolsConfig()
@@ -19,6 +21,7 @@ def load_tavily_search_tool(tavily_search_max_results: int):
 tavily_search = load_tavily_search_tool(TOOLS_CFG.tavily_search_max_results)
 
 @tool
+@exact_cache(tool_name="search_tool", ttl_seconds=TOOLS_CFG.tavily_search_cache_ttl_minutes * 60)
 def search_tool(query: str) -> str:
     """
     Search the web using Tavily based on the given query and return a formatted string of results.
@@ -32,8 +35,14 @@ def search_tool(query: str) -> str:
     results = tavily_search.invoke(query)
     # Optionally, format the results as a string for LLM consumption
     if isinstance(results, list):
-        return "\n\n".join(
-            f"{item.get('title', '')}\n{item.get('url', '')}\n{item.get('content', '')}"
-            for item in results
-        )
-    return str(results)
\ No newline at end of file
+        buf = io.StringIO()
+        for i, item in enumerate(results):
+            if i:
+                buf.write("\n\n")
+            buf.write(item.get("title", ""))
+            buf.write("\n")
+            buf.write(item.get("url", ""))
+            buf.write("\n")
+            buf.write(item.get("content", ""))
+        return buf.getvalue()
+    return str(results)
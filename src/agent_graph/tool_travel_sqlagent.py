@@ -1,17 +1,19 @@
+import threading
 from langchain_core.tools import tool
-from langchain_community.utilities import SQLDatabase
-from langchain.chains import create_sql_query_chain
-from langchain_community.tools.sql_database.tool import QuerySQLDataBaseTool
 from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough, RunnableLambda
 from operator import itemgetter
+from functools import lru_cache
 from .extract_sql_query import extract_sql_query
 from agent_graph.load_tools_config import LoadToolsConfig
+from agent_graph.exact_cache import exact_cache
 
 TOOLS_CFG = LoadToolsConfig()
 
+# Tools may run concurrently; make sure each instance is only built once.
+_AGENT_LOCK = threading.Lock()
+
 
 class TravelSQLAgentTool:   
     """
@@ -40,6 +42,12 @@ class TravelSQLAgentTool:
             llm_temerature (float): Temperature setting for the model (controls randomness).
             llm_api_key (str): API key for the language model provider.
         """
+        # Imported here so that building the graph doesn't load the SQL/Gemini stack up front
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from langchain_community.utilities import SQLDatabase
+        from langchain.chains import create_sql_query_chain
+        from langchain_community.tools.sql_database.tool import QuerySQLDataBaseTool
+
         self.sql_agent_llm = ChatGoogleGenerativeAI(
             model=llm,
             temperature=llm_temerature,
@@ -71,7 +79,29 @@ class TravelSQLAgentTool:
         )
 
 
+def _get_agent(llm: str, sqldb_directory: str, llm_temerature: float, llm_api_key: str) -> TravelSQLAgentTool:
+    """
+    Build the TravelSQLAgentTool once per configuration and reuse it across tool calls.
+
+    Returns:
+        TravelSQLAgentTool: Cached agent instance for the given configuration.
+    """
+    with _AGENT_LOCK:
+        return _build_agent(llm, sqldb_directory, llm_temerature, llm_api_key)
+
+
+@lru_cache(maxsize=1)
+def _build_agent(llm: str, sqldb_directory: str, llm_temerature: float, llm_api_key: str) -> TravelSQLAgentTool:
+    return TravelSQLAgentTool(
+        llm=llm,
+        sqldb_directory=sqldb_directory,
+        llm_temerature=llm_temerature,
+        llm_api_key=llm_api_key
+    )
+
+
 @tool
+@exact_cache(tool_name="query_travel_sqldb")
 def query_travel_sqldb(query: str) -> str:
     """
     Query the travel-related SQL database using a natural language question.
@@ -82,11 +112,11 @@ def query_travel_sqldb(query: str) -> str:
     Returns:
         str: Final answer generated from SQL results using the language model.
     """
-    agent = TravelSQLAgentTool(
-        llm=TOOLS_CFG.travel_sqlagent_llm,
-        sqldb_directory=TOOLS_CFG.travel_sqldb_directory,
-        llm_temerature=TOOLS_CFG.travel_sqlagent_llm_temperature,
-        llm_api_key=TOOLS_CFG.travel_sqlagent_api_key
+    agent = _get_agent(
+        TOOLS_CFG.travel_sqlagent_llm,
+        TOOLS_CFG.travel_sqldb_directory,
+        TOOLS_CFG.travel_sqlagent_llm_temperature,
+        TOOLS_CFG.travel_sqlagent_api_key
     )
     response = agent.chain.invoke({"question": query})
     return response
@@ -1,19 +1,47 @@
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 from chatbot.load_config import LoadProjectConfig
 from agent_graph.load_tools_config import LoadToolsConfig
 from agent_graph.build_full_graph import build_graph
 from utils.app_utils import create_directory
 from chatbot.memory import Memory
+import streamlit as st
 import re
 
 PROJECT_CFG = LoadProjectConfig()
 TOOLS_CFG = LoadToolsConfig()
 
-graph = build_graph()
+
+@st.cache_resource
+def get_graph():
+    """
+    Build the agent graph once per server process.
+
+    Streamlit keeps cached resources across script reruns and module reloads, so the tool
+    bindings and the compiled graph (including its MemorySaver checkpointer, which is
+    thread-safe) are shared by every rerun instead of being rebuilt.
+
+    Returns:
+        CompiledStateGraph: The compiled agent graph.
+    """
+    return build_graph()
+
+
+graph = get_graph()
 config = {"configurable": {"thread_id": TOOLS_CFG.thread_id}}
 
 create_directory("memory")
 
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+
+
+def _visible(text: str) -> str:
+    """
+    Strip <think>...</think> blocks from (possibly partial) model output.
+
+    An unclosed <think> block at the end of a partial response is hidden as well.
+    """
+    return _THINK_RE.sub("", text).split("<think>", 1)[0].strip()
+
 
 class ChatBot:
     """
@@ -29,6 +57,8 @@ class ChatBot:
         respond(chatbot: List, message: str) -> List:
             Processes the user input using the LangGraph-based graph and returns
             an updated chatbot history after storing it in memory.
+        respond_stream(chatbot: List, message: str) -> Iterator[str]:
+            Same as `respond`, but yields the visible response as it is generated.
     """
     @staticmethod
     def respond(chatbot: List, message: str) -> List:
@@ -57,10 +87,55 @@ class ChatBot:
 
         # Extract the visible content (remove <think>...</think>)
         full_content = event["messages"][-1].content
-        visible_content = re.sub(r"<think>.*?</think>", "", full_content, flags=re.DOTALL).strip()
+        visible_content = _visible(full_content)
 
         chatbot.append((message, visible_content))
 
         Memory.write_chat_history_to_file(
             streamlit_chatbot=chatbot, folder_path=PROJECT_CFG.memory_dir, thread_id=TOOLS_CFG.thread_id)
         return "", chatbot
+
+    @staticmethod
+    def respond_stream(chatbot: List, message: str) -> Iterator[str]:
+        """
+        Processes a user message using the agent graph and yields the response while it is generated.
+
+        Content tokens of the primary LLM are received through LangGraph's "custom" stream mode.
+        Text produced before a tool call is discarded once the tool call is known, so only the
+        answer to the user is shown. When the graph finishes, the final response is appended to
+        `chatbot` and written to the memory file, as in `respond`.
+
+        Args:
+            chatbot (List): List of (user_message, bot_response) tuples. Updated in place.
+            message (str): The user message to process.
+
+        Yields:
+            str: The visible part of the response generated so far.
+        """
+        events = graph.stream(
+            {"messages": [{"role": "user", "content": message}]}, config, stream_mode=["custom", "values"]
+        )
+        buffer = ""
+        shown = ""
+        final_message = None
+        for mode, chunk in events:
+            if mode == "custom":
+                buffer += chunk
+                visible = _visible(buffer)
+                if visible != shown:
+                    shown = visible
+                    yield shown
+            else:
+                final_message = chunk["messages"][-1]
+                # A new LLM step starts after tool calls/results; drop the intermediate text
+                if getattr(final_message, "tool_calls", None) or final_message.type == "tool":
+                    buffer = ""
+
+        visible_content = _visible(final_message.content)
+        if visible_content != shown:
+            yield visible_content
+
+        chatbot.append((message, visible_content))
+
+        Memory.write_chat_history_to_file(
+            streamlit_chatbot=chatbot, folder_path=PROJECT_CFG.memory_dir, thread_id=TOOLS_CFG.thread_id)
@@ -1,7 +1,7 @@
+import csv
 import os
-import pandas as pd
 from typing import List
-from datetime import datetime, date
+from datetime import datetime
 
 
 class Memory:
@@ -30,25 +30,20 @@ class Memory:
             - Columns: 'thread_id', 'timestamp', 'user_query', 'response'
             - Appends to existing file if present, or creates a new one.
         """
-        tmp_list = list(streamlit_chatbot[-1])  # Convert the tuple to a list
+        user_query, response = streamlit_chatbot[-1]
 
-        today_str = date.today().strftime('%Y-%m-%d')
-        tmp_list.insert(0, thread_id)  # Add the new value to the list
-
-        current_time_str = datetime.now().strftime('%H:%M:%S')
-        tmp_list.insert(1, current_time_str)  # Add the new value to the list
+        # Read the clock once; ISO formatting gives the same YYYY-MM-DD / HH:MM:SS strings as strftime
+        now = datetime.now()
+        today_str = now.date().isoformat()
+        current_time_str = now.time().isoformat(timespec="seconds")
 
         # File path for today's CSV file
         file_path = os.path.join(folder_path, f'{today_str}.csv')
 
-        # Create a DataFrame from the list
-        new_df = pd.DataFrame([tmp_list], columns=[
-                              "thread_id", "timestamp", "user_query", "response"])
-
-        # Check if the file for today exists
-        if os.path.exists(file_path):
-            # If it exists, append the new data to the CSV file
-            new_df.to_csv(file_path, mode='a', header=False, index=False)
-        else:
-            # If it doesn't exist, create the CSV file with the new data
-            new_df.to_csv(file_path, mode='w', header=True, index=False)
+        # Append the row; the header is only written when the file is created
+        new_file = not os.path.exists(file_path)
+        with open(file_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            if new_file:
+                writer.writerow(["thread_id", "timestamp", "user_query", "response"])
+            writer.writerow([thread_id, current_time_str, user_query, response])
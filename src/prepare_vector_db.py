@@ -1,11 +1,77 @@
 import chromadb
-import spacy
 import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
 import yaml
 from pyprojroot import here
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from dotenv import load_dotenv
+from tqdm import tqdm
+from agent_graph.embedder import load_encoder
+from agent_graph.numpy_index import NumpyIndex
+from agent_graph.semantic_cache import invalidate_vectordb
+
+# HNSW settings for the small policy/stories corpora: a sparser graph (M) keeps the index small,
+# while a larger search/construction ef keeps recall high.
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 8,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 40,
+}
+
+# Written into the vectordb directory once it has been fully built
+DONE_SENTINEL = ".done"
+
+# Chunks shorter than this (in characters) carry too little context to be retrieved on their own
+MIN_CHUNK_CHARS = 100
+
+
+def merge_small_chunks(texts: List[str], min_chars: int, max_chars: int) -> Tuple[List[str], int]:
+    """
+    Drop empty chunks and fold chunks shorter than `min_chars` into the preceding chunk.
+
+    A short chunk is appended to its predecessor when the result stays within `max_chars`.
+    Short chunks at the start of the document (e.g., a title) are prepended to the first
+    standalone chunk instead. Short chunks that fit nowhere are discarded. Call it once per
+    source document so that text is never attached to a chunk of another document.
+
+    Args:
+        texts (List[str]): Chunk texts of one document, in document order.
+        min_chars (int): Minimum length of a standalone chunk.
+        max_chars (int): Maximum length of a chunk after merging.
+
+    Returns:
+        Tuple[List[str], int]: The cleaned chunk texts and the number of chunks dropped.
+    """
+    merged = []
+    leading = []  # short chunks seen before the first standalone chunk
+    dropped = 0
+    for text in texts:
+        text = text.strip()
+        if len(text) >= min_chars:
+            prefix = "\n".join(leading)
+            if leading and len(prefix) + 1 + len(text) <= max_chars:
+                text = f"{prefix}\n{text}"
+            else:
+                dropped += len(leading)
+            leading = []
+            merged.append(text)
+        elif not text:
+            dropped += 1
+        elif merged:
+            if len(merged[-1]) + 1 + len(text) <= max_chars:
+                merged[-1] = f"{merged[-1]}\n{text}"
+            else:
+                dropped += 1
+        else:
+            leading.append(text)
+    if leading:
+        # The whole document is shorter than min_chars; keep it as a single chunk
+        merged.append("\n".join(leading))
+    return merged, dropped
 
 
 class PrepareVectorDB:
@@ -21,17 +87,15 @@ class PrepareVectorDB:
         doc_dir (str): Path to the directory containing documents (PDFs) to be processed.
         chunk_size (int): The maximum size of each chunk (in characters) into which the document text will be split.
         chunk_overlap (int): The number of overlapping characters between consecutive chunks.
-        embedding_model (str): The name of the embedding model to be used for generating vector representations of text.
+        embedding_backend (str): The embedding backend, either "spacy" or "onnx".
+        embedding_model (str): The spaCy model name or ONNX model directory used for generating vector representations of text.
         vectordb_dir (str): Directory where the resulting vector database will be stored.
         collection_name (str): The name of the collection to be used within the vector database.
 
     Methods:
-        path_maker(file_name: str, doc_dir: str) -> str:
-            Creates a full file path by joining the given directory and file name.
-
         run() -> None:
             Executes the process of reading documents, splitting text, embedding them into vectors, and 
-            saving the resulting vector database. If the vector database directory already exists, it skips
+            saving the resulting vector database. If the vector database was already built, it skips
             the creation process.
     """
 
@@ -40,7 +104,9 @@ class PrepareVectorDB:
                  chunk_size: int,
                  chunk_overlap: int,
                  vectordb_dir: str,
-                 collection_name: str
+                 collection_name: str,
+                 embedding_backend: str,
+                 embedding_model: str
                  ) -> None:
         """
         Initializes the PrepareVectorDB class with directory paths and chunking parameters.
@@ -51,82 +117,121 @@ class PrepareVectorDB:
             chunk_overlap (int): Number of overlapping characters between chunks.
             vectordb_dir (str): Output directory for storing vector DB.
             collection_name (str): Collection name used in Chroma DB.
+            embedding_backend (str): Embedding backend, either "spacy" or "onnx".
+            embedding_model (str): spaCy model name or ONNX model directory.
         """
         self.doc_dir = doc_dir
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.vectordb_dir = vectordb_dir
         self.collection_name = collection_name
-
-    def path_maker(self, file_name: str, doc_dir):
-        """
-        Creates a full file path by joining the provided directory and file name.
-
-        Args:
-            file_name (str): Name of the file.
-            doc_dir (str): Path of the directory.
-
-        Returns:
-            str: Full path of the file.
-        """
-        return os.path.join(here(doc_dir), file_name)
+        self.embedding_backend = embedding_backend
+        self.embedding_model = embedding_model
+        # here() walks up the tree looking for project markers, so resolve the paths only once
+        self._doc_root = str(here(doc_dir))
+        self._vectordb_path = str(here(vectordb_dir))
 
     def run(self):
         """
         Executes the main logic to create and store document embeddings in a VectorDB.
 
-        If the vector database directory doesn't exist:
+        If the vector database hasn't been built yet (no `.done` sentinel in `vectordb_dir`, or
+        missing `NumpyIndex` files, as in databases built by earlier versions of this script):
         - It loads PDF documents from the `doc_dir`, splits them into chunks,
         - Embeds the document chunks using the specified embedding model,
-        - Stores the embeddings in a persistent VectorDB directory.
+        - Stores the embeddings in a persistent VectorDB directory, together with the embedding
+          matrix used for exact search by `NumpyIndex`.
 
-        If the directory already exists, it skips the embedding creation process.
+        Otherwise it skips the embedding creation process. An interrupted build leaves no sentinel
+        and is redone from scratch on the next run.
 
         Prints the creation status and the number of vectors in the vector database.
 
         Returns:
             None
         """
-        if not os.path.exists(here(self.vectordb_dir)):
-            # If it doesn't exist, create the directory and create the embeddings
-            os.makedirs(here(self.vectordb_dir))
-            print(f"Directory '{self.vectordb_dir}' was created.")
-
-            file_list = os.listdir(here(self.doc_dir))
-            docs = [PyPDFLoader(self.path_maker(
-                fn, self.doc_dir)).load_and_split() for fn in file_list]
-            docs_list = [item for sublist in docs for item in sublist]
-
-            text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-                chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
+        os.makedirs(self._vectordb_path, exist_ok=True)
+        sentinel = os.path.join(self._vectordb_path, DONE_SENTINEL)
+        if not (os.path.exists(sentinel) and NumpyIndex.exists(self._vectordb_path)):
+            # Not built yet (or a previous build was interrupted or predates the NumPy index)
+            print(f"Building VectorDB in '{self.vectordb_dir}'.")
+
+            # DirEntry.path already holds the full path, so no per-file join is needed
+            with os.scandir(self._doc_root) as entries:
+                file_list = [e.path for e in entries if e.is_file() and e.name.lower().endswith(".pdf")]
+
+            # Chunk by characters; the spaCy embeddings don't need token-accurate chunk lengths
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                separators=["\n\n", "\n", ". ", " ", ""],
+                length_function=len
             )
-            doc_splits = text_splitter.split_documents(docs_list)
 
-            # Load spaCy model
+            # PDFs are independent, so load them concurrently. Pages are split as each file
+            # arrives and only the chunk texts are kept, not the page and chunk Documents.
+            texts = []
+            num_dropped = 0
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(file_list)))) as executor:
+                for pages in executor.map(lambda path: PyPDFLoader(path).load_and_split(), file_list):
+                    # Skip empty chunks and merge tiny ones into their neighbour within the same
+                    # document, so none is embedded on its own
+                    merged, dropped = merge_small_chunks(
+                        [split.page_content for split in text_splitter.split_documents(pages)],
+                        MIN_CHUNK_CHARS, int(self.chunk_size * 1.05))
+                    texts.extend(merged)
+                    num_dropped += dropped
+            print(f"Dropped {num_dropped} empty or too short chunks.")
+            # Drop repeated chunks (headers, footers, boilerplate), keeping the first occurrence.
+            # They would be embedded for nothing and fill the top-k results with identical text.
+            num_chunks = len(texts)
+            texts = list(dict.fromkeys(texts))
+            print(f"Skipped {num_chunks - len(texts)} duplicate chunks.")
+
+            # Load the embedding model (same encoder the RAG tools use at query time)
             try:
-                nlp = spacy.load(os.getenv("EMBEDDING_MODEL_NAME"))
+                encoder = load_encoder(self.embedding_backend, self.embedding_model)
             except OSError:
                 raise ValueError("spaCy model not found. Run: python -m spacy download en_core_web_lg")
 
-            # Generate embeddings for each chunk
-            texts = [doc.page_content for doc in doc_splits]
-            embeddings = [nlp(text).vector for text in texts]
+            # Generate embeddings for all chunks in batches, as one contiguous (N, dim) float32 matrix
+            embeddings = encoder.encode_batch(
+                texts,
+                batch_size=int(os.getenv("SPACY_BATCH_SIZE", "64")),
+                n_process=int(os.getenv("SPACY_N_PROCESS", max(1, (os.cpu_count() or 1) // 2)))
+            )
+            # L2-normalize the rows in place (one vectorized pass, no extra copy)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            np.divide(embeddings, np.maximum(norms, 1e-12), out=embeddings)
             ids = [str(i) for i in range(len(texts))]
 
             # Use Chroma native client
-            client = chromadb.PersistentClient(path=str(here(self.vectordb_dir)))
-            collection = client.get_or_create_collection(name=self.collection_name)
-            collection.add(
-                ids=ids,
-                documents=texts,
-                embeddings=embeddings
-            )
+            client = chromadb.PersistentClient(path=self._vectordb_path)
+            # Drop what an interrupted build may have left behind
+            if self.collection_name in [c.name for c in client.list_collections()]:
+                client.delete_collection(self.collection_name)
+            collection = client.create_collection(name=self.collection_name, metadata=HNSW_METADATA)
+            # Insert in batches to stay below Chroma's maximum batch size and keep memory bounded
+            batch_size = int(os.getenv("CHROMA_BATCH", "200"))
+            for start in tqdm(range(0, len(texts), batch_size), desc=f"Adding to {self.collection_name}"):
+                collection.add(
+                    ids=ids[start:start + batch_size],
+                    documents=texts[start:start + batch_size],
+                    embeddings=embeddings[start:start + batch_size]
+                )
+
+            # Embedding matrix for exact search (retrieval_backend: numpy)
+            NumpyIndex.save(self._vectordb_path, embeddings, texts, normalized=True)
+
+            open(sentinel, "w").close()
+            # Cached RAG responses hold chunks of the previous build
+            invalidate_vectordb(self._vectordb_path)
 
             print("VectorDB is created and saved.")
             print("Number of vectors in vectordb:",
                   collection.count(), "\n\n")
         else:
-            print(f"Directory '{self.vectordb_dir}' already exists.")
+            print(f"VectorDB in '{self.vectordb_dir}' already exists.")
 
 
 if __name__ == "__main__":
@@ -141,13 +246,17 @@ if __name__ == "__main__":
     vectordb_dir = app_config["swiss_airline_policy_rag"]["vectordb"]
     collection_name = app_config["swiss_airline_policy_rag"]["collection_name"]
     doc_dir = app_config["swiss_airline_policy_rag"]["unstructured_docs"]
+    embedding_backend = app_config["swiss_airline_policy_rag"]["embedding_backend"]
+    embedding_model = app_config["swiss_airline_policy_rag"]["embedding_model"]
 
     prepare_db_instance = PrepareVectorDB(
         doc_dir=doc_dir,
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         vectordb_dir=vectordb_dir,
-        collection_name=collection_name)
+        collection_name=collection_name,
+        embedding_backend=embedding_backend,
+        embedding_model=embedding_model)
 
     prepare_db_instance.run()
 
@@ -157,12 +266,16 @@ if __name__ == "__main__":
     vectordb_dir = app_config["stories_rag"]["vectordb"]
     collection_name = app_config["stories_rag"]["collection_name"]
     doc_dir = app_config["stories_rag"]["unstructured_docs"]
+    embedding_backend = app_config["stories_rag"]["embedding_backend"]
+    embedding_model = app_config["stories_rag"]["embedding_model"]
 
     prepare_db_instance = PrepareVectorDB(
         doc_dir=doc_dir,
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         vectordb_dir=vectordb_dir,
-        collection_name=collection_name)
+        collection_name=collection_name,
+        embedding_backend=embedding_backend,
+        embedding_model=embedding_model)
 
     prepare_db_instance.run()
@@ -1,7 +1,12 @@
 import base64
+import functools
+import mimetypes
+import re
 import markdown2
 import streamlit as st
+import streamlit.components.v1 as components
 
+@functools.lru_cache(maxsize=8)
 def get_image_base64(image_path):
     try:
         with open(image_path, "rb") as image_file:
@@ -10,15 +15,21 @@ def get_image_base64(image_path):
         return ""  # fallback to blank avatar
 
 
-def setup_css(user_avatar, bot_avatar):
-    st.markdown(f"""
+@functools.lru_cache(maxsize=8)
+def get_avatar_uri(image_path):
+    # Full data: URI, built once per image and passed as-is to render_chat
+    mime_type = mimetypes.guess_type(image_path)[0] or "image/png"
+    return f"data:{mime_type};base64,{get_image_base64(image_path)}"
+
+
+_CSS = """
         <style>
-        .main .block-container {{
+        .main .block-container {
             max-width: 100vw !important;
             padding-left: 0rem;
             padding-right: 0rem;
-        }}
-        .chat-container {{
+        }
+        .chat-container {
             background: #252529;
             border-radius: 15px;
             padding: 2vw 1vw 10vw 1vw;
@@ -27,105 +38,134 @@ def setup_css(user_avatar, bot_avatar):
             overflow-y: auto;
             scrollbar-width: thin;
             -webkit-overflow-scrolling: touch;
-        }}
-        .stTextInput > div > div > input {{
+        }
+        .stTextInput > div > div > input {
             width: 100% !important;
             font-size: 1.0em;
             padding: 1em;
             border-radius: 12px;
             height: auto;
-        }}
-        .stButton > button {{
+        }
+        .stButton > button {
             width: 100%;
             font-size: 1.0em;
             border-radius: 12px;
             margin-top: 0;
-        }}
-        .form-container {{
+        }
+        .form-container {
             width: 100%;
             max-width: 100%;
             margin: 0 auto;
             padding: 1em 0 0 0;
-        }}
-        .input-row {{
+        }
+        .input-row {
             display: flex;
             gap: 10px;
             align-items: center;
-        }}
-        .input-field {{
+        }
+        .input-field {
             flex: 1;
-        }}
-        .send-button {{
+        }
+        .send-button {
             margin-top: 28px !important;  /* Move it down */
             /* or margin-top: -10px !important; to move it up */
-        }}
-        .clear-button {{
+        }
+        .clear-button {
             margin-top: 10px;
-        }}
-        .chat-row {{
+        }
+        .chat-row {
             display: flex;
             margin-bottom: 15px;
-        }}
-        .user-row {{ justify-content: flex-end; }}
-        .ai-row {{ justify-content: flex-start; }}
-        .chat-bubble {{
+        }
+        .user-row { justify-content: flex-end; }
+        .ai-row { justify-content: flex-start; }
+        .chat-bubble {
             max-width: 80%;
             padding: 10px 20px;
             border-radius: 18px;
             font-size: 1em;
             line-height: 1.3;
             word-break: break-word;
-        }}
-        .user-bubble {{
+        }
+        .user-bubble {
             background-color: #d1f5d3;
             color: #222;
             border-bottom-right-radius: 4px;
             margin-right: 10px;
-        }}
-        .ai-bubble {{
+        }
+        .ai-bubble {
             background-color: #333336;
             color: #fff;
             border-bottom-left-radius: 4px;
             margin-left: 10px;
-        }}
-        .avatar {{
+        }
+        .avatar {
             width: 25px;
             height: 25px;
             border-radius: 50%;
             object-fit: cover;
             background: #fff;
-        }}
+        }
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+# st.markdown doesn't execute <script> tags, so the auto-scroll runs in a zero-height component
+# iframe. It registers one MutationObserver on the page that keeps the chatbox scrolled to the
+# bottom whenever the chat is re-rendered; the flag stops reruns from adding more observers.
+_SCROLL_JS = """
+    <script>
+        const doc = window.parent.document;
+        if (!window.parent.chatScrollObserver) {
+            window.parent.chatScrollObserver = new MutationObserver(() => {
+                const chatbox = doc.getElementById('chatbox');
+                if (chatbox) chatbox.scrollTop = chatbox.scrollHeight;
+            });
+            window.parent.chatScrollObserver.observe(doc.body, {childList: true, subtree: true});
+        }
+    </script>
+"""
+
+
+def setup_css():
+    st.markdown(_CSS, unsafe_allow_html=True)
+    components.html(_SCROLL_JS, height=0)
 
 def format_message(text):
     return text.replace('\n', '<br>')
 
-def render_chat(chat_history, user_avatar, bot_avatar):
-    user_avatar_src = f"data:image/png;base64,{user_avatar}"
-    bot_avatar_src = f"data:image/png;base64,{bot_avatar}"
+# Characters/line starts that can make markdown2 produce more than a plain paragraph. Inline
+# HTML and entities (< and &) are left to markdown2 as well, so they render the same on both paths.
+_MARKDOWN_RE = re.compile(r"[*_`#\[>|~\\<&]|^\s*(?:[-+]|\d+\.)\s", re.MULTILINE)
+
+# Earlier turns are redrawn on every rerun; render each message's markdown only once
+@functools.lru_cache(maxsize=512)
+def _md(text):
+    # Plain-text messages (the common case) skip the markdown parser
+    if not _MARKDOWN_RE.search(text):
+        return f"<p>{format_message(text)}</p>"
+    return markdown2.markdown(format_message(text))
 
-    chat_html = '<div class="chat-container" id="chatbox">'
-    for user_msg, bot_msg in chat_history:
-        chat_html += (
+def render_chat(chat_history, user_avatar_uri, bot_avatar_uri):
+    user_img = f'<img src="{user_avatar_uri}" class="avatar" />'
+    bot_img = f'<img src="{bot_avatar_uri}" class="avatar" />'
+
+    # HTML of the turns rendered on earlier reruns; only new turns are formatted
+    rendered_turns = st.session_state.setdefault("rendered_turns", [])
+    if len(rendered_turns) > len(chat_history):
+        rendered_turns.clear()  # chat was cleared
+    for user_msg, bot_msg in chat_history[len(rendered_turns):]:
+        rendered_turns.append(
             f'<div class="chat-row user-row">'
-            f'<div class="chat-bubble user-bubble">{markdown2.markdown(format_message(user_msg))}</div>'
-            f'<img src="{user_avatar_src}" class="avatar" />'
+            f'<div class="chat-bubble user-bubble">{_md(user_msg)}</div>'
+            f'{user_img}'
             f'</div>'
             f'<div class="chat-row ai-row">'
-            f'<img src="{bot_avatar_src}" class="avatar" />'
-            f'<div class="chat-bubble ai-bubble">{markdown2.markdown(format_message(bot_msg))}</div>'
+            f'{bot_img}'
+            f'<div class="chat-bubble ai-bubble">{_md(bot_msg)}</div>'
             f'</div>'
         )
-    chat_html += '</div>'
-    st.markdown(chat_html, unsafe_allow_html=True)
-
-    st.markdown("""
-        <script>
-            var chatbox = document.getElementById('chatbox');
-            if (chatbox) chatbox.scrollTop = chatbox.scrollHeight;
-        </script>
-    """, unsafe_allow_html=True)
+    chat_html = "".join(rendered_turns)
+    st.markdown(f'<div class="chat-container" id="chatbox">{chat_html}</div>', unsafe_allow_html=True)
 
 def chat_input_form():
     st.markdown('<div class="form-container">', unsafe_allow_html=True)
@@ -1,6 +1,12 @@
 import os
+import sys
+from pathlib import Path
 from pyprojroot import here
 
+# Set once the google.longrunning symlink is known to be in place. This module stays in
+# sys.modules across Streamlit reruns, so later reruns skip the filesystem checks.
+_SYMLINK_DONE = False
+
 
 def create_directory(directory_path: str) -> None:
     """
@@ -9,6 +15,40 @@ def create_directory(directory_path: str) -> None:
     Args:
         directory_path (str): Relative path from project root to the directory.
     """
-    full_path = here(directory_path)
-    if not os.path.exists(full_path):
-        os.makedirs(full_path)
+    os.makedirs(here(directory_path), exist_ok=True)
+
+
+def ensure_longrunning_symlink() -> None:
+    """
+    Symlink `google.longrunning` into the fireworks package to avoid the duplicate proto file error.
+
+    The filesystem is only inspected until the symlink is confirmed, so Streamlit reruns
+    return immediately.
+    """
+    global _SYMLINK_DONE
+    if _SYMLINK_DONE:
+        return
+    try:
+        py_version = f"python{sys.version_info.major}.{sys.version_info.minor}"
+        site_packages = Path(sys.prefix) / "lib" / py_version / "site-packages"
+
+        google_longrunning = site_packages / "google" / "longrunning"
+        fireworks_google_path = site_packages / "fireworks" / "control_plane" / "generated" / "protos_grpcio" / "google"
+        fireworks_longrunning = fireworks_google_path / "longrunning"
+
+        if fireworks_longrunning.is_symlink():
+            _SYMLINK_DONE = True  # already symlinked, no action needed
+            return
+        if fireworks_longrunning.exists():
+            print("[Warning] Cannot remove or replace non-symlink folder due to permission. Import may fail.")
+            _SYMLINK_DONE = True
+            return
+
+        if google_longrunning.exists():
+            os.makedirs(fireworks_google_path, exist_ok=True)
+            os.symlink(google_longrunning, fireworks_longrunning)
+            print("[Info] Symlinked google.longrunning → fireworks path")
+            _SYMLINK_DONE = True
+
+    except Exception as e:
+        print(f"[Error] Failed to set symlink for google.longrunning: {e}")